@@ -0,0 +1,177 @@
+# analytic_env.py
+import heapq
+import math
+
+import numpy as np
+
+from core_env import BulletHellEnv, Bullet, Player, W, H, CULL_MARGIN
+
+
+class AnalyticBulletHellEnv(BulletHellEnv):
+    """
+    BulletHellEnv with bullets kept as a trajectory schedule instead of integrated state.
+    - Each bullet stores (spawn_time, origin, velocity, exit_time); its position at time t is
+      origin + v * (t - spawn_time), so nothing is integrated per step.
+    - The time a bullet leaves the culling box is solved at spawn, so culling is a heap pop.
+    - Spawning, RNG draws, reward and termination are identical to BulletHellEnv.
+    - The schedule keeps every bullet of the episode, so positions can be queried at any past time.
+    """
+    def __init__(self, *args, capacity: int = 512, **kwargs):
+        self._capacity = int(capacity)
+        super().__init__(*args, **kwargs)
+
+    def reset(self):
+        self.player = Player(W / 2, H / 2)
+        self.t = 0.0
+        self._spawn_acc = 0.0
+        self.done = False
+
+        # bullet clock; unlike self.t it also advances on the step that ends the episode
+        self.clock = 0.0
+
+        # episode history, for queries at past times
+        n = self._capacity
+        self._t0 = np.empty(n)
+        self._ox = np.empty(n)
+        self._oy = np.empty(n)
+        self._vx = np.empty(n)
+        self._vy = np.empty(n)
+        self._end = np.empty(n)          # time the bullet was removed (culled or capped), inf while live
+        self._n = 0                      # bullets spawned this episode
+
+        # live bullets: index -> (t0, ox, oy, vx, vy, Bullet), in spawn order so the first key is
+        # the oldest. The per-step path stays in plain Python: with the few dozen live bullets this
+        # env produces, NumPy call overhead costs more than the loop it would replace.
+        self._live: dict[int, tuple[float, float, float, float, float, Bullet]] = {}
+        self._exit_heap: list[tuple[float, int]] = []
+
+        self._states_cache = None        # live (x, y, vx, vy) at the current clock
+        self._bullets_cache = None       # live Bullet objects, rebuilt when the live set changes
+        self._bullets_clock = None       # clock their x, y were last written for
+
+    # ---------------- schedule ----------------
+    def _grow(self):
+        n = self._capacity * 2
+        for name in ("_t0", "_ox", "_oy", "_vx", "_vy", "_end"):
+            old = getattr(self, name)
+            new = np.empty(n)
+            new[:self._capacity] = old
+            setattr(self, name, new)
+        self._capacity = n
+
+    @staticmethod
+    def _time_to_exit(x, y, vx, vy) -> float:
+        """Time until a bullet at (x, y) moving at (vx, vy) leaves the culling box."""
+        lo, hi_x, hi_y = -CULL_MARGIN, W + CULL_MARGIN, H + CULL_MARGIN
+        tx = (hi_x - x) / vx if vx > 0 else (lo - x) / vx if vx < 0 else math.inf
+        ty = (hi_y - y) / vy if vy > 0 else (lo - y) / vy if vy < 0 else math.inf
+        return min(tx, ty)
+
+    def _remove(self, i: int, t: float):
+        del self._live[i]
+        self._end[i] = t
+        self._states_cache = None
+        self._bullets_cache = None
+
+    def _spawn_bullet(self):
+        x, y, vx, vy = self._sample_bullet()
+
+        if self._n == self._capacity:
+            self._grow()
+        i = self._n
+        self._n += 1
+
+        # spawned before this step's move, so the bullet is at origin + v * dt once the step ends
+        t0 = self.clock
+        self._t0[i] = t0
+        self._ox[i], self._oy[i] = x, y
+        self._vx[i], self._vy[i] = vx, vy
+        self._end[i] = math.inf
+        # the Bullet starts at its origin, which is its position at the current clock
+        self._live[i] = (t0, x, y, vx, vy, Bullet(x, y, vx, vy))
+        heapq.heappush(self._exit_heap, (t0 + self._time_to_exit(x, y, vx, vy), i))
+        self._states_cache = None
+        self._bullets_cache = None
+
+        if len(self._live) > self.max_bullets:
+            self._remove(next(iter(self._live)), t0)
+
+    def _advance_bullets(self, dt: float):
+        self.clock += dt
+        self._states_cache = None
+
+        # a bullet is culled on the first step that ends strictly past its exit time
+        heap = self._exit_heap
+        while heap and heap[0][0] < self.clock:
+            exit_t, i = heapq.heappop(heap)
+            if i in self._live:  # capped bullets leave stale heap entries
+                self._remove(i, exit_t)
+
+    def _player_hit(self) -> bool:
+        p = self.player
+        px, py = p.x, p.y
+        rr = p.r + Bullet.r
+        rr2 = rr * rr
+        c = self.clock
+        for t0, ox, oy, vx, vy, _ in self._live.values():
+            age = c - t0
+            dx = ox + vx * age - px
+            # cheap axis screen; most bullets are far away in x
+            if dx > rr or dx < -rr:
+                continue
+            dy = oy + vy * age - py
+            if dx * dx + dy * dy <= rr2:
+                return True
+        return False
+
+    # ---------------- queries ----------------
+    def live_states(self) -> list[tuple[float, float, float, float]]:
+        """(x, y, vx, vy) of the live bullets at the current clock; cached until the schedule changes."""
+        if self._states_cache is None:
+            c = self.clock
+            self._states_cache = [
+                (ox + vx * (c - t0), oy + vy * (c - t0), vx, vy)
+                for t0, ox, oy, vx, vy, _ in self._live.values()
+            ]
+        return self._states_cache
+
+    def _history(self, t: float):
+        n = self._n
+        idx = np.flatnonzero((self._t0[:n] < t) & (t <= self._end[:n]))
+        age = t - self._t0[idx]
+        return idx, age
+
+    def bullet_positions(self, t: float | None = None):
+        """
+        Positions of the bullets on screen at time t (bullet clock, default: now).
+        t may be any time in [0, clock] of the current episode.
+        returns: xs, ys arrays
+        """
+        states = self.bullet_states(t)
+        return states[:, 0], states[:, 1]
+
+    def bullet_states(self, t: float | None = None) -> np.ndarray:
+        """(n, 4) array of x, y, vx, vy for the bullets on screen at time t (default: now)."""
+        if t is None or t == self.clock:
+            return np.array(self.live_states()).reshape(-1, 4)
+        idx, age = self._history(t)
+        return np.stack([
+            self._ox[idx] + self._vx[idx] * age,
+            self._oy[idx] + self._vy[idx] * age,
+            self._vx[idx],
+            self._vy[idx],
+        ], axis=1)
+
+    @property
+    def bullets(self) -> list[Bullet]:
+        # for code written against BulletHellEnv (get_state, rendering, get_features):
+        # each live bullet keeps one Bullet whose x, y are rewritten at most once per clock value
+        if self._bullets_cache is None:
+            self._bullets_cache = [entry[5] for entry in self._live.values()]
+        c = self.clock
+        if self._bullets_clock != c:
+            for t0, ox, oy, vx, vy, b in self._live.values():
+                b.x = ox + vx * (c - t0)
+                b.y = oy + vy * (c - t0)
+            self._bullets_clock = c
+        return self._bullets_cache
@@ -0,0 +1,243 @@
+# baselines.py
+"""
+Scripted baseline policies acting on batched array state, plus a benchmark mode.
+
+    python baselines.py --envs 64 --episodes 500
+    python baselines.py --policy lookahead --analytic
+    python baselines.py --compare q_table.pkl
+
+Every policy maps a BatchObs of n envs to n actions (0 up, 1 down, 2 left, 3 right, 4 stay).
+"""
+import argparse
+import random
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from core_env import BulletHellEnv, Bullet, Player, W, H
+from analytic_env import AnalyticBulletHellEnv
+from config import ENV_KWARGS, DT, MAX_STEPS
+from evaluate import load_policy, summarize, format_summary
+
+# unit move per action, same order as BulletHellEnv.step
+ACTION_DIRS = np.array([(0.0, -1.0), (0.0, 1.0), (-1.0, 0.0), (1.0, 0.0), (0.0, 0.0)])
+
+CENTER_WEIGHT = 0.01     # tie-break toward the map centre, per px
+STAY_COST = 2.0          # px-equivalent score cost of "stay" (mirrors the env's idle penalty)
+
+FLEE_CAP = 150.0         # px, distance beyond which flee_nearest treats the nearest bullet as harmless
+FLEE_HORIZON = 0.1       # s, how far ahead flee_nearest looks at its own move
+
+FIELD_RADIUS = 300.0     # px, bullets further away exert no force
+WALL_GAIN = 0.5          # wall repulsion relative to a bullet at the same distance
+
+LOOKAHEAD_HORIZON = 0.6  # s, how long each candidate action is held
+LOOKAHEAD_STEPS = 6      # sample points along the horizon
+LOOKAHEAD_CAP = 40.0     # px, clearance beyond this counts as safe; larger caps chase far bullets
+
+
+# ============================================================
+# ====================== BATCHED STATE =======================
+# ============================================================
+@dataclass
+class BatchObs:
+    players: np.ndarray   # (n, 2) x, y
+    bullets: np.ndarray   # (n, m, 4) x, y, vx, vy, zero padded
+    mask: np.ndarray      # (n, m) True for real bullets
+    envs: list
+
+
+def observe(envs) -> BatchObs:
+    n = len(envs)
+    players = np.array([(e.player.x, e.player.y) for e in envs])
+
+    per_env = [np.array(e.live_states()).reshape(-1, 4) for e in envs]
+
+    m = max(1, max(len(b) for b in per_env))
+    bullets = np.zeros((n, m, 4))
+    mask = np.zeros((n, m), dtype=bool)
+    for i, b in enumerate(per_env):
+        bullets[i, :len(b)] = b
+        mask[i, :len(b)] = True
+    return BatchObs(players, bullets, mask, envs)
+
+
+def _candidate_positions(players, t):
+    """(n, actions, ...) player positions after holding each action for time t (clamped)."""
+    t = np.asarray(t)
+    step = ACTION_DIRS[:, None, :] * Player.speed * t[None, :, None]      # (actions, k, 2)
+    pos = players[:, None, None, :] + step[None]                           # (n, actions, k, 2)
+    return np.clip(pos, Player.r, [W - Player.r, H - Player.r])
+
+
+def _tie_break(pos):
+    """(n, actions) cost separating equally safe moves: distance to the map centre, idling."""
+    cost = CENTER_WEIGHT * np.hypot(pos[..., 0] - W / 2, pos[..., 1] - H / 2)
+    cost[:, 4] += STAY_COST
+    return cost
+
+
+# ============================================================
+# ====================== POLICIES ============================
+# ============================================================
+def random_policy(obs: BatchObs) -> np.ndarray:
+    return np.random.randint(0, len(ACTION_DIRS), size=len(obs.players))
+
+
+def flee_nearest(obs: BatchObs) -> np.ndarray:
+    """Take the move that ends furthest from the currently nearest bullet."""
+    d = np.hypot(*(obs.bullets[..., :2] - obs.players[:, None, :]).transpose(2, 0, 1))
+    d = np.where(obs.mask, d, np.inf)
+    nearest = obs.bullets[np.arange(len(d)), d.argmin(axis=1), :2]         # (n, 2)
+
+    pos = _candidate_positions(obs.players, [FLEE_HORIZON])[:, :, 0]        # (n, actions, 2)
+    dist = np.hypot(*(pos - nearest[:, None, :]).transpose(2, 0, 1))
+    dist = np.where(obs.mask.any(axis=1)[:, None], dist, np.inf)
+
+    score = np.minimum(dist, FLEE_CAP) - _tie_break(pos)
+    return score.argmax(axis=1)
+
+
+def potential_field(obs: BatchObs) -> np.ndarray:
+    """Follow the sum of inverse-square repulsion from nearby bullets and the walls."""
+    rel = obs.players[:, None, :] - obs.bullets[..., :2]                     # (n, m, 2)
+    d = np.maximum(np.hypot(rel[..., 0], rel[..., 1]), 1.0)
+    w = np.where(obs.mask & (d < FIELD_RADIUS), 1.0 / d ** 3, 0.0)
+    force = (rel * w[..., None]).sum(axis=1)                                 # (n, 2)
+
+    x, y = obs.players[:, 0], obs.players[:, 1]
+    force[:, 0] += WALL_GAIN * (1.0 / np.maximum(x, 1.0) ** 2 - 1.0 / np.maximum(W - x, 1.0) ** 2)
+    force[:, 1] += WALL_GAIN * (1.0 / np.maximum(y, 1.0) ** 2 - 1.0 / np.maximum(H - y, 1.0) ** 2)
+
+    # one of two opposite moves always scores >= 0, so argmax alone would never pick "stay";
+    # stay explicitly when no net force acts (e.g. at the map centre with no bullets nearby)
+    actions = (force @ ACTION_DIRS.T).argmax(axis=1)
+    return np.where((force == 0.0).all(axis=1), 4, actions)
+
+
+def lookahead(obs: BatchObs) -> np.ndarray:
+    """
+    Hold each action for LOOKAHEAD_HORIZON and keep the one with the largest minimum clearance,
+    using the env's straight-line bullet motion to predict where every bullet will be.
+    """
+    t = np.linspace(LOOKAHEAD_HORIZON / LOOKAHEAD_STEPS, LOOKAHEAD_HORIZON, LOOKAHEAD_STEPS)
+    pos = _candidate_positions(obs.players, t)                               # (n, actions, k, 2)
+
+    b = obs.bullets
+    future = b[:, None, :, :2] + b[:, None, :, 2:] * t[None, :, None, None]   # (n, k, m, 2)
+    rel = pos[:, :, :, None, :] - future[:, None]                            # (n, actions, k, m, 2)
+    clear = np.hypot(rel[..., 0], rel[..., 1]) - (Player.r + Bullet.r)
+    clear = np.where(obs.mask[:, None, None, :], clear, np.inf)
+
+    score = np.minimum(clear.min(axis=(2, 3)), LOOKAHEAD_CAP) - _tie_break(pos[:, :, -1])
+    return score.argmax(axis=1)
+
+
+POLICIES = {
+    "random": random_policy,
+    "flee_nearest": flee_nearest,
+    "potential_field": potential_field,
+    "lookahead": lookahead,
+}
+
+
+def batched(act):
+    """Wrap a single-env policy (env -> action), e.g. evaluate.load_policy, as a batched one."""
+    def policy(obs: BatchObs) -> np.ndarray:
+        return np.array([act(e) for e in obs.envs])
+    return policy
+
+
+# ============================================================
+# ====================== BENCHMARK ===========================
+# ============================================================
+def run_benchmark(policy, n_envs: int, episodes: int, env_cls=BulletHellEnv, seed: int = 0):
+    """
+    Step up to n_envs envs in lockstep until `episodes` episodes have finished.
+    Episode i draws its bullets from its own random.Random(seed + i), the same stream
+    evaluate.py uses for episode i, so every policy (and evaluate.py) plays the same episodes
+    regardless of n_envs or when other episodes end.
+    Every started episode runs to the end, so short episodes are not over-represented.
+    returns: (episodes, 3) array of survived, survival time, reward in episode order, and timing dict
+    """
+    np.random.seed(seed)
+
+    def start_episode(e, i):
+        e.reset()
+        e.rng = random.Random(seed + i)
+
+    envs = [env_cls(**ENV_KWARGS) for _ in range(min(n_envs, episodes))]
+    episode_ids = list(range(len(envs)))
+    for e, i in zip(envs, episode_ids):
+        start_episode(e, i)
+    ep_reward = [0.0] * len(envs)
+    ep_steps = [0] * len(envs)
+    started = len(envs)
+    results = np.zeros((episodes, 3))
+
+    steps = 0
+    env_time = 0.0
+    start = time.perf_counter()
+
+    while envs:
+        actions = policy(observe(envs))
+
+        t0 = time.perf_counter()
+        finished = []
+        for i, e in enumerate(envs):
+            reward, done = e.step(int(actions[i]), DT)
+            ep_reward[i] += reward
+            ep_steps[i] += 1
+            if done or ep_steps[i] >= MAX_STEPS:
+                results[episode_ids[i]] = (float(e.t >= e.survival_seconds), e.t, ep_reward[i])
+                if started < episodes:
+                    start_episode(e, started)
+                    episode_ids[i] = started
+                    ep_reward[i] = 0.0
+                    ep_steps[i] = 0
+                    started += 1
+                else:
+                    finished.append(i)
+        env_time += time.perf_counter() - t0
+        steps += len(envs)
+
+        for i in reversed(finished):
+            del envs[i], episode_ids[i], ep_reward[i], ep_steps[i]
+
+    total = time.perf_counter() - start
+    timing = {
+        "steps": steps,
+        "env_steps_per_s": steps / env_time,
+        "total_steps_per_s": steps / total,
+    }
+    return results, timing
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scripted baseline policies on BulletHellEnv.")
+    parser.add_argument("--policy", choices=["all", *POLICIES], default="all")
+    parser.add_argument("--compare", metavar="PATH", help="also run a saved q_table (.pkl) or weights (.npz)")
+    parser.add_argument("--envs", type=int, default=64, help="envs stepped in lockstep")
+    parser.add_argument("--episodes", type=int, default=256)
+    parser.add_argument("--analytic", action="store_true", help="use AnalyticBulletHellEnv")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    names = list(POLICIES) if args.policy == "all" else [args.policy]
+    runs = [(name, POLICIES[name]) for name in names]
+    if args.compare:
+        runs.append((args.compare, batched(load_policy(args.compare))))
+
+    env_cls = AnalyticBulletHellEnv if args.analytic else BulletHellEnv
+
+    for name, policy in runs:
+        results, timing = run_benchmark(policy, args.envs, args.episodes, env_cls, args.seed)
+        print(f"== {name} ({env_cls.__name__}, {args.envs} envs)")
+        print(f"  env steps/s {timing['env_steps_per_s']:10.0f}   "
+              f"with policy {timing['total_steps_per_s']:10.0f}")
+        print(format_summary(summarize(results), len(results), label="episodes"))
+
+
+if __name__ == "__main__":
+    main()
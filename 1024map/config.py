@@ -0,0 +1,100 @@
+# config.py
+"""
+Settings and state design shared by the trainers, evaluate.py and baselines.py.
+Importing this module has no side effects: no Q-table, env, RNG draws or pygame.
+"""
+from core_env import BulletHellEnv, W, H
+
+# ============================================================
+# ====================== TRAINING SCHEDULE ===================
+# ============================================================
+TOT_EPISODES = 15000
+SHOW_EVERY = 1000
+
+DISCOUNT = 0.95
+
+EPS_DECAY = 0.9997
+EPS_MIN = 0.05
+
+ACTIONS = 5  # up, down, left, right, stay
+
+DT = 1.0 / 60.0          # fixed simulation timestep
+MAX_STEPS = 12000        # safety cap
+
+EVAL_EPISODES = 200      # greedy episodes evaluated in the background per checkpoint (0 = off)
+EVAL_WORKERS = 2
+
+
+# ============================================================
+# ====================== ENV =================================
+# ============================================================
+ENV_KWARGS = dict(
+    spawn_interval=0.12,
+    bullet_speed=220.0,
+    survival_seconds=40.0,
+    idle_penalty=0.9,
+)
+
+
+# ============================================================
+# ====================== STATE DESIGN ========================
+# ============================================================
+SECTORS = 4
+TIME_BINS = 10
+
+DANGER_NEAR = 45.0
+DANGER_MID  = 140.0
+WALL_MARGIN = 40.0
+
+
+def sector_index(dx, dy):
+    # Right(0), Up(1), Left(2), Down(3)
+    if abs(dx) >= abs(dy):
+        return 0 if dx > 0 else 2
+    else:
+        return 3 if dy > 0 else 1
+
+
+def get_state(env: BulletHellEnv):
+    p = env.player
+    min_dist = [1e9] * SECTORS
+
+    for b in env.bullets:
+        dx = b.x - p.x
+        dy = b.y - p.y
+        s = sector_index(dx, dy)
+        dist = (dx * dx + dy * dy) ** 0.5
+        if dist < min_dist[s]:
+            min_dist[s] = dist
+
+    danger = []
+    for d in min_dist:
+        if d <= DANGER_NEAR:
+            danger.append(2)
+        elif d <= DANGER_MID:
+            danger.append(1)
+        else:
+            danger.append(0)
+
+    near_wall = 1 if (
+        p.x <= WALL_MARGIN or p.x >= W - WALL_MARGIN or
+        p.y <= WALL_MARGIN or p.y >= H - WALL_MARGIN
+    ) else 0
+
+    frac = min(1.0, env.t / env.survival_seconds)
+    time_bin = min(TIME_BINS - 1, int(frac * TIME_BINS))
+
+    return tuple(danger + [near_wall, time_bin])
+
+
+STATE_SHAPE = (3, 3, 3, 3, 2, TIME_BINS)
+
+
+def all_states():
+    for a in [0, 1, 2]:
+        for b in [0, 1, 2]:
+            for c in [0, 1, 2]:
+                for d in [0, 1, 2]:
+                    for nw in [0, 1]:
+                        for tb in range(TIME_BINS):
+                            yield (a, b, c, d, nw, tb)
@@ -4,6 +4,7 @@ import random
 from dataclasses import dataclass
 
 W, H = 1024, 1024
+CULL_MARGIN = 60.0  # bullets are removed once this far outside the map
 
 @dataclass
 class Player:
@@ -40,12 +41,11 @@ class BulletHellEnv:
         self.survival_seconds = float(survival_seconds)
         self.idle_penalty = float(idle_penalty)
 
-        self.player = Player(W / 2, H / 2)
-        self.bullets: list[Bullet] = []
+        # source of bullet randomness; the shared `random` module unless a caller
+        # gives this env its own random.Random stream
+        self.rng = random
 
-        self.t = 0.0
-        self._spawn_acc = 0.0
-        self.done = False
+        self.reset()
 
     def reset(self):
         self.player = Player(W / 2, H / 2)
@@ -59,21 +59,22 @@ class BulletHellEnv:
         p.x = max(p.r, min(W - p.r, p.x))
         p.y = max(p.r, min(H - p.r, p.y))
 
-    def _spawn_bullet(self):
+    def _sample_bullet(self):
+        """Random border origin and velocity toward a random point inside the map."""
         # spawn on border
-        side = random.randint(0, 3)
+        side = self.rng.randint(0, 3)
         if side == 0:      # top
-            x, y = random.uniform(0, W), 0.0
+            x, y = self.rng.uniform(0, W), 0.0
         elif side == 1:    # bottom
-            x, y = random.uniform(0, W), float(H)
+            x, y = self.rng.uniform(0, W), float(H)
         elif side == 2:    # left
-            x, y = 0.0, random.uniform(0, H)
+            x, y = 0.0, self.rng.uniform(0, H)
         else:              # right
-            x, y = float(W), random.uniform(0, H)
+            x, y = float(W), self.rng.uniform(0, H)
 
         # fixed target point inside map (NOT player position)
-        tx = random.uniform(0, W)
-        ty = random.uniform(0, H)
+        tx = self.rng.uniform(0, W)
+        ty = self.rng.uniform(0, H)
 
         dx = tx - x
         dy = ty - y
@@ -83,32 +84,16 @@ class BulletHellEnv:
 
         vx = self.bullet_speed * (dx / norm)
         vy = self.bullet_speed * (dy / norm)
+        return x, y, vx, vy
 
-        self.bullets.append(Bullet(x, y, vx, vy))
+    def _spawn_bullet(self):
+        self.bullets.append(Bullet(*self._sample_bullet()))
 
         if len(self.bullets) > self.max_bullets:
             self.bullets = self.bullets[-self.max_bullets:]
 
-    @staticmethod
-    def _circle_hit(ax, ay, ar, bx, by, br) -> bool:
-        dx = ax - bx
-        dy = ay - by
-        rr = ar + br
-        return (dx * dx + dy * dy) <= (rr * rr)
-
-    def step(self, action: int, dt: float):
-        """
-        action: 0 up, 1 down, 2 left, 3 right, 4 stay
-        dt: seconds
-        returns: reward, done
-        """
-        # If episode already done, do nothing (play loop can still reset anytime)
-        if self.done:
-            return 0.0, True
-
+    def _move_player(self, action: int, dt: float):
         p = self.player
-
-        # move player
         if action == 0:
             p.y -= p.speed * dt
         elif action == 1:
@@ -122,26 +107,56 @@ class BulletHellEnv:
 
         self._clamp_player()
 
-        # spawn bullets at fixed interval
-        self._spawn_acc += dt
-        while self._spawn_acc >= self.spawn_interval:
-            self._spawn_acc -= self.spawn_interval
-            self._spawn_bullet()
+    @staticmethod
+    def _circle_hit(ax, ay, ar, bx, by, br) -> bool:
+        dx = ax - bx
+        dy = ay - by
+        rr = ar + br
+        return (dx * dx + dy * dy) <= (rr * rr)
 
+    def _advance_bullets(self, dt: float):
         # move bullets
         for b in self.bullets:
             b.x += b.vx * dt
             b.y += b.vy * dt
 
         # remove off-screen bullets (with margin)
-        margin = 60.0
+        margin = CULL_MARGIN
         self.bullets = [
             b for b in self.bullets
             if (-margin <= b.x <= W + margin) and (-margin <= b.y <= H + margin)
         ]
 
+    def live_states(self) -> list[tuple[float, float, float, float]]:
+        """(x, y, vx, vy) of the bullets currently on screen."""
+        return [(b.x, b.y, b.vx, b.vy) for b in self.bullets]
+
+    def _player_hit(self) -> bool:
+        p = self.player
+        return any(self._circle_hit(p.x, p.y, p.r, b.x, b.y, b.r) for b in self.bullets)
+
+    def step(self, action: int, dt: float):
+        """
+        action: 0 up, 1 down, 2 left, 3 right, 4 stay
+        dt: seconds
+        returns: reward, done
+        """
+        # If episode already done, do nothing (play loop can still reset anytime)
+        if self.done:
+            return 0.0, True
+
+        self._move_player(action, dt)
+
+        # spawn bullets at fixed interval
+        self._spawn_acc += dt
+        while self._spawn_acc >= self.spawn_interval:
+            self._spawn_acc -= self.spawn_interval
+            self._spawn_bullet()
+
+        self._advance_bullets(dt)
+
         # collision
-        if any(self._circle_hit(p.x, p.y, p.r, b.x, b.y, b.r) for b in self.bullets):
+        if self._player_hit():
             self.done = True
             return -200.0, True
 
@@ -1,87 +1,31 @@
+import pickle
+
 import numpy as np
 import matplotlib.pyplot as plt
-import pygame
 
-from core_env import BulletHellEnv, W, H
+from core_env import BulletHellEnv
+from config import (
+    TOT_EPISODES, SHOW_EVERY, DISCOUNT, EPS_DECAY, EPS_MIN, ACTIONS, DT, MAX_STEPS,
+    EVAL_EPISODES, EVAL_WORKERS, ENV_KWARGS, STATE_SHAPE, get_state, all_states,
+)
+from evaluate import CheckpointEvaluator
+from play_pygame import render_episode
+from train_stats import TrainingStats
 
 # ============================================================
 # ====================== TRAINING PARAMS =====================
 # ============================================================
-TOT_EPISODES = 15000
-SHOW_EVERY = 1000
-
+# schedule, env settings and state design shared with the other scripts live in config.py
 LR = 0.1
-DISCOUNT = 0.95
 
 epsilon = 1.0
-EPS_DECAY = 0.9997
-EPS_MIN = 0.05
-
-ACTIONS = 5  # up, down, left, right, stay
-
-DT = 1.0 / 60.0          # fixed simulation timestep
-MAX_STEPS = 12000        # safety cap
-
-
-# ============================================================
-# ====================== STATE DESIGN ========================
-# ============================================================
-SECTORS = 4
-TIME_BINS = 10
-
-DANGER_NEAR = 45.0
-DANGER_MID  = 140.0
-WALL_MARGIN = 40.0
-
-
-def sector_index(dx, dy):
-    # Right(0), Up(1), Left(2), Down(3)
-    if abs(dx) >= abs(dy):
-        return 0 if dx > 0 else 2
-    else:
-        return 3 if dy > 0 else 1
-
-
-def get_state(env: BulletHellEnv):
-    p = env.player
-    min_dist = [1e9] * SECTORS
-
-    for b in env.bullets:
-        dx = b.x - p.x
-        dy = b.y - p.y
-        s = sector_index(dx, dy)
-        dist = (dx * dx + dy * dy) ** 0.5
-        if dist < min_dist[s]:
-            min_dist[s] = dist
-
-    danger = []
-    for d in min_dist:
-        if d <= DANGER_NEAR:
-            danger.append(2)
-        elif d <= DANGER_MID:
-            danger.append(1)
-        else:
-            danger.append(0)
-
-    near_wall = 1 if (
-        p.x <= WALL_MARGIN or p.x >= W - WALL_MARGIN or
-        p.y <= WALL_MARGIN or p.y >= H - WALL_MARGIN
-    ) else 0
-
-    frac = min(1.0, env.t / env.survival_seconds)
-    time_bin = min(TIME_BINS - 1, int(frac * TIME_BINS))
 
-    return tuple(danger + [near_wall, time_bin])
+Q_TABLE_PATH = "q_table.pkl"   # saved at every SHOW_EVERY checkpoint and at the end
 
-
-def all_states():
-    for a in [0, 1, 2]:
-        for b in [0, 1, 2]:
-            for c in [0, 1, 2]:
-                for d in [0, 1, 2]:
-                    for nw in [0, 1]:
-                        for tb in range(TIME_BINS):
-                            yield (a, b, c, d, nw, tb)
+STATS_PATH = "train_stats.npz"       # visit / TD-error / heatmap arrays, exported every checkpoint
+HEATMAP_PATH = "train_heatmap.png"
+HEAT_BINS = 64           # heatmap grid over the 1024x1024 map (16 px cells)
+TD_ACTIVE = 1.0          # (state, action) pairs with running |TD error| above this are still changing
 
 
 # ============================================================
@@ -91,126 +35,110 @@ q_table = {}
 for s in all_states():
     q_table[s] = [np.random.uniform(-1.0, 0.0) for _ in range(ACTIONS)]
 
-
-# ============================================================
-# ====================== ENV INIT ============================
-# ============================================================
-env = BulletHellEnv(
-    spawn_interval=0.12,
-    bullet_speed=220.0,
-    survival_seconds=40.0,
-    idle_penalty=0.9,
-)
+stats = TrainingStats(STATE_SHAPE, ACTIONS, bins=HEAT_BINS)
 
 
 # ============================================================
-# ====================== VISUALIZATION =======================
+# ====================== ENV INIT ============================
 # ============================================================
-def render_episode(env: BulletHellEnv, q_table):
-    pygame.init()
-    screen = pygame.display.set_mode((W, H))
-    pygame.display.set_caption("Training Visualization")
-    clock = pygame.time.Clock()
-    font = pygame.font.SysFont("consolas", 20)
-
-    env.reset()
-
-    running = True
-    while running:
-        dt = clock.tick(60) / 1000.0
+env = BulletHellEnv(**ENV_KWARGS)
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
 
-        obs = get_state(env)
-        action = int(np.argmax(q_table[obs]))
+def save_q_table(q_table, path=Q_TABLE_PATH):
+    with open(path, "wb") as f:
+        pickle.dump(q_table, f)
 
-        reward, done = env.step(action, dt)
 
-        screen.fill((18, 18, 22))
+def greedy_tabular(env: BulletHellEnv) -> int:
+    return int(np.argmax(q_table[get_state(env)]))
 
-        for b in env.bullets:
-            pygame.draw.circle(screen, (210, 210, 210),
-                               (int(b.x), int(b.y)), int(b.r))
 
-        p = env.player
-        pygame.draw.circle(screen, (255, 80, 80),
-                           (int(p.x), int(p.y)), int(p.r))
+# ============================================================
+# ====================== TRAIN LOOP ==========================
+# ============================================================
+def main():
+    global epsilon
+    episode_rewards = []
 
-        hud = font.render(
-            f"t={env.t:.2f}s bullets={len(env.bullets)} reward={reward:.1f}",
-            True, (240, 240, 240)
-        )
-        screen.blit(hud, (12, 12))
+    # checkpoints are evaluated by worker processes while training continues;
+    # each report is printed as soon as it is ready
+    with CheckpointEvaluator(EVAL_EPISODES, EVAL_WORKERS) as evaluator:
 
-        pygame.display.flip()
+        def checkpoint(episode):
+            save_q_table(q_table)
+            stats.export(STATS_PATH)
+            stats.save_heatmaps(HEATMAP_PATH)
+            print(f"Stats: {stats.summary(TD_ACTIVE)}")
+            evaluator.submit(episode, Q_TABLE_PATH)
 
-        if done:
-            pygame.time.delay(800)
-            break
+        for episode in range(TOT_EPISODES):
+            env.reset()
+            episode_reward = 0.0
 
-    pygame.quit()
+            if episode % SHOW_EVERY == 0:
+                print(f"On episode number {episode}, epsilon value is {epsilon}")
+                if len(episode_rewards) >= SHOW_EVERY:
+                    print(f"Mean for last {SHOW_EVERY} episodes : "
+                          f"{np.mean(episode_rewards[-SHOW_EVERY:])}")
 
+                # ---- checkpoint + background evaluation ----
+                checkpoint(episode)
 
-# ============================================================
-# ====================== TRAIN LOOP ==========================
-# ============================================================
-episode_rewards = []
+                # ---- visualize current policy (no training) ----
+                render_episode(env, greedy_tabular)
+                # the render leaves env done (and ran on wall-clock dt); start a real training episode
+                env.reset()
 
-for episode in range(TOT_EPISODES):
-    env.reset()
-    episode_reward = 0.0
+            for _ in range(MAX_STEPS):
+                obs = get_state(env)
 
-    if episode % SHOW_EVERY == 0:
-        print(f"On episode number {episode}, epsilon value is {epsilon}")
-        if len(episode_rewards) >= SHOW_EVERY:
-            print(f"Mean for last {SHOW_EVERY} episodes : "
-                  f"{np.mean(episode_rewards[-SHOW_EVERY:])}")
+                if np.random.random() > epsilon:
+                    action = int(np.argmax(q_table[obs]))
+                else:
+                    action = np.random.randint(0, ACTIONS)
 
-        # ---- visualize current policy (no training) ----
-        render_episode(env, q_table)
+                reward, done = env.step(action, DT)
+                episode_reward += reward
 
-    for _ in range(MAX_STEPS):
-        obs = get_state(env)
+                new_obs = get_state(env)
 
-        if np.random.random() > epsilon:
-            action = int(np.argmax(q_table[obs]))
-        else:
-            action = np.random.randint(0, ACTIONS)
+                max_future_q = np.max(q_table[new_obs])
+                current_q = q_table[obs][action]
 
-        reward, done = env.step(action, DT)
-        episode_reward += reward
+                if done:
+                    td_target = reward
+                    new_q = reward
+                else:
+                    td_target = reward + DISCOUNT * max_future_q
+                    new_q = (1 - LR) * current_q + LR * td_target
 
-        new_obs = get_state(env)
+                q_table[obs][action] = new_q
+                stats.record_step(obs, action, td_target - current_q, env.player.x, env.player.y)
 
-        max_future_q = np.max(q_table[new_obs])
-        current_q = q_table[obs][action]
+                if done:
+                    break
 
-        if done:
-            new_q = reward
-        else:
-            new_q = (1 - LR) * current_q + LR * (reward + DISCOUNT * max_future_q)
+            episode_rewards.append(episode_reward)
+            epsilon = max(EPS_MIN, epsilon * EPS_DECAY)
 
-        q_table[obs][action] = new_q
+            p = env.player
+            stats.record_episode(p.x, p.y, hit=env.done and env.t < env.survival_seconds)
+            evaluator.report()
 
-        if done:
-            break
+        checkpoint(TOT_EPISODES)
 
-    episode_rewards.append(episode_reward)
-    epsilon = max(EPS_MIN, epsilon * EPS_DECAY)
+    # ---- plot ----
+    moving_avg = np.convolve(
+        episode_rewards,
+        np.ones((SHOW_EVERY,)) / SHOW_EVERY,
+        mode="valid"
+    )
 
+    plt.plot(range(len(moving_avg)), moving_avg)
+    plt.xlabel("Episode Number")
+    plt.ylabel(f"Average reward per {SHOW_EVERY} episodes")
+    plt.show()
 
-# ============================================================
-# ====================== PLOT ================================
-# ============================================================
-moving_avg = np.convolve(
-    episode_rewards,
-    np.ones((SHOW_EVERY,)) / SHOW_EVERY,
-    mode="valid"
-)
 
-plt.plot(range(len(moving_avg)), moving_avg)
-plt.xlabel("Episode Number")
-plt.ylabel(f"Average reward per {SHOW_EVERY} episodes")
-plt.show()
+if __name__ == "__main__":
+    main()
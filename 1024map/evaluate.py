@@ -0,0 +1,197 @@
+# evaluate.py
+"""
+Greedy policy evaluation over many seeded episodes.
+
+    python evaluate.py q_table.pkl --episodes 2000 --workers 8
+    python evaluate.py linear_weights.npz
+
+Episode i always uses seed (seed + i), so checkpoints are compared on the same bullet patterns.
+"""
+import argparse
+import io
+import os
+import pickle
+import random
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from core_env import BulletHellEnv
+from config import ENV_KWARGS, DT, MAX_STEPS, get_state
+
+CHUNK = 25          # episodes per worker task
+N_BOOT = 2000       # bootstrap resamples
+CI = 0.95
+
+
+# ============================================================
+# ====================== POLICIES ============================
+# ============================================================
+def load_policy(path: str, data: bytes | None = None):
+    """
+    Greedy policy (callable env -> action) from a saved q_table (.pkl) or linear weights (.npz).
+    data: the file's contents, if already read; path then only selects the format.
+    """
+    if data is None:
+        with open(path, "rb") as f:
+            data = f.read()
+
+    if path.endswith(".npz"):
+        from linear_train import tile_coder, get_features
+
+        weights = np.load(io.BytesIO(data))["weights"]
+
+        def act(env):
+            tiles = tile_coder.active_tiles(get_features(env))[0]
+            return int(np.argmax(weights[:, tiles].sum(axis=-1)))
+        return act
+
+    q_table = pickle.loads(data)
+
+    def act(env):
+        return int(np.argmax(q_table[get_state(env)]))
+    return act
+
+
+# ============================================================
+# ====================== EPISODES ============================
+# ============================================================
+def run_episode(env: BulletHellEnv, act, seed: int):
+    """returns: survived (0/1), survival time (s), episode reward"""
+    random.seed(seed)
+    env.reset()
+    episode_reward = 0.0
+
+    for _ in range(MAX_STEPS):
+        reward, done = env.step(act(env), DT)
+        episode_reward += reward
+        if done:
+            break
+
+    survived = float(env.t >= env.survival_seconds)
+    return survived, env.t, episode_reward
+
+
+def _run_chunk(args) -> np.ndarray:
+    path, data, seeds = args
+    act = load_policy(path, data)
+    env = BulletHellEnv(**ENV_KWARGS)
+    return np.array([run_episode(env, act, s) for s in seeds]).reshape(-1, 3)
+
+
+def submit_evaluation(pool, path: str, episodes: int, seed: int = 0, data: bytes | None = None):
+    """
+    Queue an evaluation on a worker pool; pass the result to collect() when needed.
+    With data (the policy file's contents) workers never read path, so it may be overwritten meanwhile.
+    """
+    seeds = range(seed, seed + episodes)
+    chunks = [(path, data, seeds[i:i + CHUNK]) for i in range(0, episodes, CHUNK)]
+    return pool.map_async(_run_chunk, chunks)
+
+
+def collect(pending) -> np.ndarray:
+    """(episodes, 3) array of survived, survival time, reward."""
+    return np.concatenate(pending.get())
+
+
+def evaluate_policy(path: str, episodes: int = 1000, workers: int | None = None, seed: int = 0):
+    with Pool(workers) as pool:
+        return collect(submit_evaluation(pool, path, episodes, seed))
+
+
+class CheckpointEvaluator:
+    """
+    Background evaluation of training checkpoints.
+    - submit() reads the saved policy immediately and ships its bytes with the tasks,
+      so the trainer can overwrite the file and keep training without waiting.
+    - report() prints every evaluation that has finished; report(wait=True) waits for all of them.
+    - Use as a context manager: on exit the remaining results are reported (skipped on error)
+      and the pool is terminated and joined.
+    With episodes == 0 no pool is started and every call is a no-op.
+    """
+    def __init__(self, episodes: int, workers: int | None = None):
+        self.episodes = int(episodes)
+        self._pool = Pool(workers) if self.episodes else None
+        self._pending = []   # (checkpoint episode, AsyncResult), in submission order
+
+    def submit(self, episode: int, path: str):
+        if self._pool is None:
+            return
+        with open(path, "rb") as f:
+            data = f.read()
+        self._pending.append((episode, submit_evaluation(self._pool, path, self.episodes, data=data)))
+
+    def report(self, wait: bool = False):
+        while self._pending and (wait or self._pending[0][1].ready()):
+            episode, pending = self._pending.pop(0)
+            results = collect(pending)
+            print(f"Eval of checkpoint at episode {episode}: "
+                  + format_summary(summarize(results), len(results)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._pool is None:
+            return
+        try:
+            if exc_type is None:
+                self.report(wait=True)
+        finally:
+            # every result is collected by now unless training failed; like Pool.__exit__,
+            # terminate rather than close, then wait for the workers to exit
+            self._pool.terminate()
+            self._pool.join()
+
+
+# ============================================================
+# ====================== STATISTICS ==========================
+# ============================================================
+def bootstrap_ci(x: np.ndarray, n_boot: int = N_BOOT, ci: float = CI, seed: int = 0):
+    """Percentile bootstrap interval for the mean of x."""
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, len(x), size=(n_boot, len(x)))
+    means = x[idx].mean(axis=1)
+    tail = (1.0 - ci) / 2.0 * 100.0
+    lo, hi = np.percentile(means, [tail, 100.0 - tail])
+    return float(lo), float(hi)
+
+
+def summarize(results: np.ndarray) -> dict:
+    """metric -> (mean, ci_low, ci_high)"""
+    summary = {}
+    for name, col in (("survival_rate", 0), ("survival_time", 1), ("reward", 2)):
+        x = results[:, col]
+        summary[name] = (float(x.mean()), *bootstrap_ci(x))
+    return summary
+
+
+def format_summary(summary: dict, episodes: int, label: str = "greedy episodes") -> str:
+    lines = [f"{episodes} {label} ({CI:.0%} bootstrap CI)"]
+    for name, (mean, lo, hi) in summary.items():
+        lines.append(f"  {name:<14s} {mean:10.3f}   [{lo:.3f}, {hi:.3f}]")
+    return "\n".join(lines)
+
+
+# ============================================================
+# ====================== CLI =================================
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate a saved policy with greedy rollouts.")
+    parser.add_argument("policy", help="q_table .pkl from episodes_train.py or weights .npz from linear_train.py")
+    parser.add_argument("--episodes", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first episode")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = evaluate_policy(args.policy, args.episodes, args.workers, args.seed)
+    elapsed = time.perf_counter() - start
+
+    print(format_summary(summarize(results), len(results)))
+    print(f"  {elapsed:.1f}s, {len(results) / elapsed:.1f} episodes/s on {args.workers} workers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+import math
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from core_env import BulletHellEnv, W, H
+from config import (
+    TOT_EPISODES, SHOW_EVERY, DISCOUNT, EPS_DECAY, EPS_MIN,
+    ACTIONS, DT, MAX_STEPS, ENV_KWARGS, EVAL_EPISODES, EVAL_WORKERS, SECTORS, sector_index,
+)
+from evaluate import CheckpointEvaluator
+from play_pygame import render_episode
+
+# ============================================================
+# ====================== TRAINING PARAMS =====================
+# ============================================================
+# Linear Q-learning over tile-coded continuous features.
+# Drop-in alternative to the tabular loop in episodes_train.py:
+# same env, episode budget, exploration schedule, checkpoint evaluation and visualization.
+LR = 0.1                 # step size, split across active tiles
+BATCH_STEPS = 8          # transitions per sparse weight update (LR * BATCH_STEPS < 1)
+WEIGHTS_PATH = "linear_weights.npz"
+
+epsilon = 1.0
+
+
+# ============================================================
+# ====================== FEATURES ============================
+# ============================================================
+DIST_MAX = 400.0         # px, distances beyond this look the same
+TTC_MAX = 3.0            # s, time-to-contact beyond this looks the same
+
+# feature layout (all scaled to [0, 1]):
+#   0, 1                 player x, y
+#   2 .. 2+SECTORS-1     nearest bullet distance per sector
+#   6 .. 6+SECTORS-1     min time-to-contact per sector
+#   10                   episode time fraction
+F_POS = 0
+F_DIST = 2
+F_TTC = F_DIST + SECTORS
+F_TIME = F_TTC + SECTORS
+N_FEATURES = F_TIME + 1
+
+
+def get_features(env: BulletHellEnv) -> np.ndarray:
+    # per-bullet work stays in plain Python like get_state: with the few dozen
+    # live bullets this env produces, it is cheaper than building arrays every step
+    p = env.player
+    dist = [DIST_MAX] * SECTORS
+    ttc = [TTC_MAX] * SECTORS
+
+    for b in env.bullets:
+        dx = b.x - p.x
+        dy = b.y - p.y
+        s = sector_index(dx, dy)
+        d = math.hypot(dx, dy)
+        if d < dist[s]:
+            dist[s] = d
+
+        # closing speed along the line of sight; only approaching bullets have a finite ttc
+        closing = -(dx * b.vx + dy * b.vy)
+        if closing > 0.0:
+            t = max(d - (p.r + b.r), 0.0) * d / closing
+            if t < ttc[s]:
+                ttc[s] = t
+
+    frac = min(1.0, env.t / env.survival_seconds)
+    return np.array(
+        [p.x / W, p.y / H]
+        + [d / DIST_MAX for d in dist]
+        + [t / TTC_MAX for t in ttc]
+        + [frac]
+    )
+
+
+# ============================================================
+# ====================== TILE CODING =========================
+# ============================================================
+NUM_TILINGS = 8
+
+# (feature columns tiled jointly, tiles per dimension)
+TILE_GROUPS = (
+    [((F_POS, F_POS + 1), 8)]
+    + [((F_DIST + s, F_TTC + s), 8) for s in range(SECTORS)]
+    + [((F_TIME,), 10)]
+)
+
+
+class TileCoder:
+    """
+    Sparse binary features from offset grid tilings.
+    - Each group of feature columns is tiled jointly by NUM_TILINGS grids,
+      displaced by asymmetric fractions of a tile.
+    - One active tile per (group, tiling), so every state has the same number of active indices.
+    """
+    def __init__(self, groups, num_tilings: int):
+        self.groups = [(tuple(cols), int(tiles)) for cols, tiles in groups]
+        self.num_tilings = int(num_tilings)
+
+        # all groups are coded in one pass: pad every group to the widest one,
+        # padded dimensions get stride 0 so they never change the index
+        G = len(self.groups)
+        D = max(len(cols) for cols, _ in self.groups)
+        T = self.num_tilings
+        k = np.arange(T)
+
+        self._cols = np.zeros((G, D), dtype=np.int64)
+        self._scale = np.zeros((G, D))
+        self._disp = np.zeros((G, T, D), dtype=np.int64)
+        self._strides = np.zeros((G, D), dtype=np.int64)
+        self._base = np.zeros((G, T), dtype=np.int64)
+
+        base = 0
+        for g, (cols, tiles) in enumerate(self.groups):
+            d = len(cols)
+            side = tiles + 1  # one extra cell absorbs the offset overflow at 1.0
+            self._cols[g, :d] = cols
+            self._scale[g, :d] = tiles * T
+            self._disp[g, :, :d] = (k[:, None] * (2 * np.arange(d) + 1)) % T
+            self._strides[g, :d] = side ** np.arange(d)
+            self._base[g] = base + k * side ** d
+            base += T * side ** d
+
+        self.n_features = base
+        self.n_active = G * T
+
+    def active_tiles(self, feats: np.ndarray) -> np.ndarray:
+        """
+        feats: (N_FEATURES,) or (batch, N_FEATURES), values in [0, 1]
+        returns: (batch, n_active) int64 indices into the weight vector
+        """
+        feats = np.atleast_2d(feats)
+        scaled = (np.clip(feats[:, self._cols], 0.0, 1.0) * self._scale).astype(np.int64)
+        coords = (scaled[:, :, None, :] + self._disp) // self.num_tilings   # (batch, G, T, D)
+        tiles = self._base + (coords * self._strides[:, None, :]).sum(axis=-1)
+        return tiles.reshape(feats.shape[0], self.n_active)
+
+
+# ============================================================
+# ====================== WEIGHTS =============================
+# ============================================================
+tile_coder = TileCoder(TILE_GROUPS, NUM_TILINGS)
+weights = np.zeros((ACTIONS, tile_coder.n_features))
+
+
+def q_values(tiles: np.ndarray) -> np.ndarray:
+    return weights[:, tiles].sum(axis=-1)
+
+
+def greedy_linear(env: BulletHellEnv) -> int:
+    tiles = tile_coder.active_tiles(get_features(env))[0]
+    return int(np.argmax(q_values(tiles)))
+
+
+def apply_batch(obs_tiles, actions, rewards, next_tiles, dones):
+    """Semi-gradient Q-learning update for a batch of transitions, accumulated with np.add.at."""
+    q_sa = weights[actions[:, None], obs_tiles].sum(axis=1)
+    max_future_q = weights[:, next_tiles].sum(axis=-1).max(axis=0)
+    target = rewards + DISCOUNT * max_future_q * (1.0 - dones)
+    delta = target - q_sa
+
+    alpha = LR / tile_coder.n_active
+    np.add.at(weights, (actions[:, None], obs_tiles), (alpha * delta)[:, None])
+
+
+# ============================================================
+# ====================== TRAIN LOOP ==========================
+# ============================================================
+def main():
+    global epsilon
+    episode_rewards = []
+    env = BulletHellEnv(**ENV_KWARGS)
+
+    # states visited since the last flush: row 0 is the state the batch starts from,
+    # row k + 1 the state after transition k. Every state is tile-coded once: by a greedy
+    # action choice that needs its tiles, or else in one active_tiles call per flush.
+    feat_buf = np.empty((BATCH_STEPS + 1, N_FEATURES))
+    tile_buf = np.empty((BATCH_STEPS + 1, tile_coder.n_active), dtype=np.int64)
+    coded = [False] * (BATCH_STEPS + 1)
+    act_buf = np.empty(BATCH_STEPS, dtype=np.int64)
+    rew_buf = np.empty(BATCH_STEPS)
+    done_buf = np.empty(BATCH_STEPS)
+
+    def flush(n):
+        todo = [k for k in range(n + 1) if not coded[k]]
+        if todo:
+            tile_buf[todo] = tile_coder.active_tiles(feat_buf[todo])
+        apply_batch(tile_buf[:n], act_buf[:n], rew_buf[:n], tile_buf[1:n + 1], done_buf[:n])
+
+        # the last state starts the next batch
+        feat_buf[0] = feat_buf[n]
+        tile_buf[0] = tile_buf[n]
+        coded[0] = True
+
+    # checkpoints are evaluated by worker processes while training continues
+    with CheckpointEvaluator(EVAL_EPISODES, EVAL_WORKERS) as evaluator:
+
+        def checkpoint(episode):
+            np.savez(WEIGHTS_PATH, weights=weights)
+            evaluator.submit(episode, WEIGHTS_PATH)
+
+        for episode in range(TOT_EPISODES):
+            env.reset()
+            episode_reward = 0.0
+
+            if episode % SHOW_EVERY == 0:
+                print(f"On episode number {episode}, epsilon value is {epsilon}")
+                if len(episode_rewards) >= SHOW_EVERY:
+                    print(f"Mean for last {SHOW_EVERY} episodes : "
+                          f"{np.mean(episode_rewards[-SHOW_EVERY:])}")
+
+                # ---- checkpoint + background evaluation ----
+                checkpoint(episode)
+
+                # ---- visualize current policy (no training) ----
+                render_episode(env, greedy_linear)
+                env.reset()
+
+            feat_buf[0] = get_features(env)
+            coded[0] = False
+            n = 0
+
+            for _ in range(MAX_STEPS):
+                if np.random.random() > epsilon:
+                    if not coded[n]:
+                        tile_buf[n] = tile_coder.active_tiles(feat_buf[n])[0]
+                        coded[n] = True
+                    action = int(np.argmax(q_values(tile_buf[n])))
+                else:
+                    action = np.random.randint(0, ACTIONS)
+
+                reward, done = env.step(action, DT)
+                episode_reward += reward
+
+                feat_buf[n + 1] = get_features(env)
+                coded[n + 1] = False
+                act_buf[n] = action
+                rew_buf[n] = reward
+                done_buf[n] = float(done)
+                n += 1
+
+                if n == BATCH_STEPS or done:
+                    flush(n)
+                    n = 0
+
+                if done:
+                    break
+
+            if n:
+                flush(n)
+
+            episode_rewards.append(episode_reward)
+            epsilon = max(EPS_MIN, epsilon * EPS_DECAY)
+            evaluator.report()
+
+        checkpoint(TOT_EPISODES)
+        print(f"Saved weights to {WEIGHTS_PATH}")
+
+    # ---- plot ----
+    moving_avg = np.convolve(
+        episode_rewards,
+        np.ones((SHOW_EVERY,)) / SHOW_EVERY,
+        mode="valid"
+    )
+
+    plt.plot(range(len(moving_avg)), moving_avg)
+    plt.xlabel("Episode Number")
+    plt.ylabel(f"Average reward per {SHOW_EVERY} episodes")
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
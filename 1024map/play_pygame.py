@@ -2,6 +2,52 @@
 import pygame
 from core_env import BulletHellEnv, W, H
 
+def render_episode(env: BulletHellEnv, act):
+    # act: callable env -> action index (greedy policy, no exploration)
+    pygame.init()
+    screen = pygame.display.set_mode((W, H))
+    pygame.display.set_caption("Training Visualization")
+    clock = pygame.time.Clock()
+    font = pygame.font.SysFont("consolas", 20)
+
+    env.reset()
+
+    running = True
+    while running:
+        dt = clock.tick(60) / 1000.0
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+        action = act(env)
+
+        reward, done = env.step(action, dt)
+
+        screen.fill((18, 18, 22))
+
+        for b in env.bullets:
+            pygame.draw.circle(screen, (210, 210, 210),
+                               (int(b.x), int(b.y)), int(b.r))
+
+        p = env.player
+        pygame.draw.circle(screen, (255, 80, 80),
+                           (int(p.x), int(p.y)), int(p.r))
+
+        hud = font.render(
+            f"t={env.t:.2f}s bullets={len(env.bullets)} reward={reward:.1f}",
+            True, (240, 240, 240)
+        )
+        screen.blit(hud, (12, 12))
+
+        pygame.display.flip()
+
+        if done:
+            pygame.time.delay(800)
+            break
+
+    pygame.quit()
+
 def action_from_keys(keys) -> int:
     if keys[pygame.K_w] or keys[pygame.K_UP]:
         return 0
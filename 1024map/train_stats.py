@@ -0,0 +1,97 @@
+# train_stats.py
+import numpy as np
+from matplotlib.figure import Figure
+
+from core_env import W, H
+
+
+class TrainingStats:
+    """
+    Low-overhead training counters kept next to a tabular Q-table.
+    - visits:        per-(state, action) update counts
+    - td_abs:        running mean of |TD error| per (state, action) (exponential, rate td_rate)
+    - position_heat: player positions every step, on a bins x bins grid over the W x H map
+    - death_heat:    player positions at the moment of a hit
+    All arrays are preallocated; recording a step is a handful of scalar writes.
+    """
+    def __init__(self, state_shape, n_actions: int, bins: int = 64, td_rate: float = 0.05):
+        self.state_shape = tuple(state_shape)
+        self.n_states = int(np.prod(self.state_shape))
+        self.n_actions = int(n_actions)
+        self.bins = int(bins)
+        self.td_rate = float(td_rate)
+
+        # mixed-radix strides: state tuple -> flat row index
+        self._strides = [int(np.prod(self.state_shape[i + 1:])) for i in range(len(self.state_shape))]
+
+        self.visits = np.zeros((self.n_states, self.n_actions), dtype=np.int64)
+        self.td_abs = np.zeros((self.n_states, self.n_actions))
+        self.position_heat = np.zeros((self.bins, self.bins), dtype=np.int64)
+        self.death_heat = np.zeros((self.bins, self.bins), dtype=np.int64)
+        self.episodes = 0
+
+    def state_index(self, obs) -> int:
+        return sum(v * s for v, s in zip(obs, self._strides))
+
+    def _cell(self, x: float, y: float):
+        cx = min(self.bins - 1, max(0, int(x * self.bins / W)))
+        cy = min(self.bins - 1, max(0, int(y * self.bins / H)))
+        return cy, cx
+
+    def record_step(self, obs, action: int, td_error: float, x: float, y: float):
+        i = self.state_index(obs)
+        err = abs(td_error)
+        if self.visits[i, action] == 0:
+            self.td_abs[i, action] = err
+        else:
+            self.td_abs[i, action] += self.td_rate * (err - self.td_abs[i, action])
+        self.visits[i, action] += 1
+        self.position_heat[self._cell(x, y)] += 1
+
+    def record_episode(self, x: float, y: float, hit: bool):
+        self.episodes += 1
+        if hit:
+            self.death_heat[self._cell(x, y)] += 1
+
+    def summary(self, td_threshold: float = 1.0) -> str:
+        visited = self.visits > 0
+        states = int(visited.any(axis=1).sum())
+        pairs = int(visited.sum())
+        active = int((self.td_abs[visited] > td_threshold).sum())
+        mean_td = float(self.td_abs[visited].mean()) if pairs else 0.0
+        return (f"visited states {states}/{self.n_states}, "
+                f"pairs {pairs}/{self.visits.size}, "
+                f"mean |TD| {mean_td:.3f}, "
+                f"pairs with |TD| > {td_threshold:g}: {active}")
+
+    def export(self, path: str):
+        np.savez_compressed(
+            path,
+            state_shape=np.array(self.state_shape),
+            visits=self.visits,
+            td_abs=self.td_abs,
+            position_heat=self.position_heat,
+            death_heat=self.death_heat,
+            episodes=self.episodes,
+        )
+
+    def save_heatmaps(self, path: str):
+        # plain Figure, so saving from inside the training loop never touches pyplot state
+        fig = Figure(figsize=(12, 4))
+        panels = (
+            ("Player positions (log)", np.log1p(self.position_heat)),
+            ("Deaths", self.death_heat),
+            ("Visits per state (log)", np.log1p(self.visits.sum(axis=1)).reshape(-1, self.state_shape[-1])),
+        )
+        for k, (title, data) in enumerate(panels):
+            ax = fig.add_subplot(1, 3, k + 1)
+            if k < 2:
+                im = ax.imshow(data, origin="upper", extent=(0, W, H, 0))
+            else:
+                im = ax.imshow(data, aspect="auto", interpolation="nearest")
+                ax.set_xlabel("time bin")
+                ax.set_ylabel("other state components")
+            ax.set_title(title)
+            fig.colorbar(im, ax=ax)
+        fig.tight_layout()
+        fig.savefig(path)